@@ -1,21 +1,22 @@
+import itertools
+
 import streamlit as st
 import numpy as np
 import pandas as pd
-from scipy.optimize import linprog
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="LP Solver", layout="wide")
 
-# --- INITIALIZE RESET COUNTER ---
-if "reset_counter" not in st.session_state:
-    st.session_state.reset_counter = 0
+# --- APP PROFILE ---
+# Widget defaults and labels, kept in one place
+LP_PROFILE = {
+    "caption": "Quantitative Methods - Simplex Method Result",
+    "default_value": 0.0,
+    "default_constraints": 4,
+    "max_constraints": 10,
+}
 
-def reset_state():
-    """Increments the counter to force Streamlit to render brand new widgets."""
-    st.session_state.reset_counter += 1
-
-# --- UI STYLING ---
-st.markdown("""
+CSS = """
     <style>
     a.header-anchor { display: none; }
     [data-testid="stHeader"] { display: none; }
@@ -35,12 +36,175 @@ st.markdown("""
         }
     }
 
-    .stTable { overflow-x: auto !important; display: block; }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# --- INITIALIZE RESET COUNTER ---
+def make_widget_keys(reset_counter):
+    """Builds every widget key for one reset generation."""
+    names = ["goal", "obj_x", "obj_y", "num_con", "constraints"]
+    return {name: f"{name}_{reset_counter}" for name in names}
+
+if "reset_counter" not in st.session_state:
+    st.session_state.reset_counter = 0
+
+# Checked separately so sessions that predate widget_keys still get it
+if "widget_keys" not in st.session_state:
+    st.session_state.widget_keys = make_widget_keys(st.session_state.reset_counter)
+
+def reset_state():
+    """Increments the counter to force Streamlit to render brand new widgets."""
+    st.session_state.reset_counter += 1
+    st.session_state.widget_keys = make_widget_keys(st.session_state.reset_counter)
+    st.session_state.pop("constraints_base", None)
+    st.session_state.pop("constraints_edited", None)
+
+# Keys are only rebuilt on reset; ordinary reruns reuse the stored strings
+keys = st.session_state.widget_keys
+
+# --- SOLVER ---
+# Number of corner points shown in the reconstructed iteration history
+HISTORY_STEPS = 5
+TOL = 1e-7
+
+# Relations are encoded as small ints so assembly works on plain numeric arrays
+REL_CODES = {"<=": 0, ">=": 1, "=": 2}
+
+def snap_zero(v):
+    """Replaces values within TOL of zero (including -0.0) with 0.0 so they never display as -0.000."""
+    return np.where(np.abs(v) <= TOL, 0.0, v)
+
+def assemble(xs, ys, rels, rhss):
+    """Builds (A_ub, b_ub, A_eq, b_eq) from per-constraint coefficient arrays."""
+    A = np.column_stack((xs, ys))
+    b = rhss.copy()
+
+    # ">=" rows become "<=" rows by negating both sides
+    mask_ge = rels == 1
+    A[mask_ge] = -A[mask_ge]; b[mask_ge] = -b[mask_ge]
+
+    is_eq = rels == 2
+    return A[~is_eq], b[~is_eq], A[is_eq], b[is_eq]
+
+def trace_vertices(c, A_ub, b_ub, A_eq, b_eq, x_opt):
+    """Rebuilds a simplex-like path: feasible corner points with improving Z, ending at the optimum."""
+    # Every constraint line plus the X = 0 and Y = 0 axes from linprog's default bounds
+    lines_A = np.vstack((A_ub, A_eq, np.eye(2)))
+    lines_b = np.concatenate((b_ub, b_eq, np.zeros(2)))
+
+    vertices = []
+    for i, j in itertools.combinations(range(len(lines_b)), 2):
+        M = lines_A[[i, j]]
+        # Rank rather than an absolute determinant, so small coefficients still form corners
+        if np.linalg.matrix_rank(M) < 2:
+            continue
+        v = np.linalg.solve(M, lines_b[[i, j]])
+        if (np.all(v >= -TOL) and np.all(A_ub @ v <= b_ub + TOL)
+                and np.all(np.abs(A_eq @ v - b_eq) <= TOL)):
+            vertices.append(v)
+
+    z_opt = c @ x_opt
+    path = []
+    if vertices:
+        # Adding 0.0 turns any -0.0 left by the rounding into 0.0 before display
+        vertices = np.unique(np.round(vertices, 9) + 0.0, axis=0)
+        z = vertices @ c
+        # Worst to best, keeping only the corners just before the optimum.
+        # The optimum itself is matched by position, since its rounded Z can drift from z_opt
+        at_opt = np.all(np.isclose(vertices, x_opt, rtol=TOL, atol=TOL), axis=1)
+        order = np.argsort(-z)
+        order = order[~at_opt[order] & (z[order] > z_opt + TOL * max(1.0, abs(z_opt)))][-(HISTORY_STEPS - 1):]
+        path = [(float(z[i]), float(vertices[i, 0]), float(vertices[i, 1])) for i in order]
+
+    x_opt = snap_zero(x_opt)
+    path.append((float(z_opt), float(x_opt[0]), float(x_opt[1])))
+    return path
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def solve_lp(c_tuple, constraints_tuple):
+    """Solves the LP with HiGHS. Inputs are tuples so repeat solves are cache hits."""
+    # SciPy is imported on first solve so it does not delay the first page render
+    from scipy.optimize import linprog
+    from scipy.sparse import csr_matrix
+
+    n = len(constraints_tuple)
+    xs = np.fromiter((con[0] for con in constraints_tuple), dtype=np.float64, count=n)
+    ys = np.fromiter((con[1] for con in constraints_tuple), dtype=np.float64, count=n)
+    rels = np.fromiter((REL_CODES[con[2]] for con in constraints_tuple), dtype=np.int8, count=n)
+    rhss = np.fromiter((con[3] for con in constraints_tuple), dtype=np.float64, count=n)
+
+    A_ub, b_ub, A_eq, b_eq = assemble(xs, ys, rels, rhss)
+    c = np.asarray(c_tuple, dtype=np.float64)
+
+    # Two independent "=" rows pin (X, Y) to one point: solve 2x2 directly if it is feasible
+    if len(A_eq) == 2 and np.linalg.matrix_rank(A_eq) == 2:
+        # The 2x2 solve leaves round-off like -4e-16 where the answer is 0
+        x = snap_zero(np.linalg.solve(A_eq, b_eq))
+        if np.all(x >= -TOL) and np.all(A_ub @ x <= b_ub + TOL):
+            z = float(c @ x)
+            return True, z, x, "Optimal solution found (unique point of the equality constraints).", [(z, float(x[0]), float(x[1]))]
+
+    # HiGHS dual simplex, compiled backend; it consumes CSR input without densifying
+    res = linprog(c,
+                  A_ub=csr_matrix(A_ub) if len(A_ub) > 0 else None, 
+                  b_ub=b_ub if len(b_ub) > 0 else None, 
+                  A_eq=csr_matrix(A_eq) if len(A_eq) > 0 else None, 
+                  b_eq=b_eq if len(b_eq) > 0 else None, 
+                  method='highs-ds')
+
+    if not res.success:
+        return res.success, res.fun, res.x, res.message, []
+
+    # HiGHS can return -0.0 or round-off like -8e-15 at the bounds
+    x = snap_zero(res.x)
+    path = trace_vertices(c, A_ub, b_ub, A_eq, b_eq, x)
+    return res.success, res.fun, x, res.message, path
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_iter_table(logs_tuple, mode):
+    """Builds the display-ready iteration history once per distinct set of solver results."""
+    iter_df = pd.DataFrame(list(logs_tuple), columns=["Z", "X", "Y"], dtype=np.float64)
+    # Adding 0.0 turns the -0.0 from the sign flip into 0.0 before formatting
+    if mode == "Maximize": iter_df["Z"] = -iter_df["Z"] + 0.0
+    iter_df.columns = ["Objective Value (Z)", "X Position", "Y Position"]
+    iter_df.index.name = "Step"
+    return iter_df
+
+@st.cache_resource(show_spinner=False)
+def warmup_linprog():
+    """Imports SciPy and runs a trivial HiGHS solve once per process so the first real solve is fast."""
+    from scipy.optimize import linprog
+    linprog([1.0, 1.0], A_ub=[[1.0, 1.0]], b_ub=[1.0], method='highs-ds')
+    return True
+
+def default_constraints(n):
+    """Builds n constraint rows filled with the profile defaults."""
+    return pd.DataFrame({
+        "x": np.full(n, LP_PROFILE["default_value"], dtype=np.float64),
+        "y": np.full(n, LP_PROFILE["default_value"], dtype=np.float64),
+        "rel": pd.Categorical(["<="] * n, categories=list(REL_CODES)),
+        "rhs": np.full(n, LP_PROFILE["default_value"], dtype=np.float64),
+    })
+
+def resize_constraints(prev, n):
+    """Pads or truncates the last edited grid to n rows so typed constraints survive a count change."""
+    if prev is None:
+        return default_constraints(n)
+    if len(prev) >= n:
+        return prev.iloc[:n].reset_index(drop=True)
+    return pd.concat([prev, default_constraints(n - len(prev))], ignore_index=True)
+
+# --- UI STYLING ---
+@st.cache_resource(show_spinner=False)
+def inject_css():
+    """Emits the stylesheet from one place; reruns replay the cached markdown element."""
+    st.markdown(CSS, unsafe_allow_html=True)
+    return True
+
+inject_css()
 
 st.title("Linear Programming Solver")
-st.caption("Quantitative Methods - Simplex Method Result")
+st.caption(LP_PROFILE["caption"])
 st.divider()
 
 # --- 1. OBJECTIVE SECTION ---
@@ -49,34 +213,41 @@ obj_cols = st.columns([1.5, 2, 2])
 
 # Keys include the reset_counter to allow for a true wipe
 with obj_cols[0]:
-    mode = st.selectbox("Goal", ["Maximize", "Minimize"], key=f"goal_{st.session_state.reset_counter}")
+    mode = st.selectbox("Goal", ["Maximize", "Minimize"], key=keys["goal"])
 with obj_cols[1]:
-    c1 = st.number_input("Coefficient of X", value=0.0, key=f"obj_x_{st.session_state.reset_counter}")
+    c1 = st.number_input("Coefficient of X", value=LP_PROFILE["default_value"], key=keys["obj_x"])
 with obj_cols[2]:
-    c2 = st.number_input("Coefficient of Y", value=0.0, key=f"obj_y_{st.session_state.reset_counter}")
+    c2 = st.number_input("Coefficient of Y", value=LP_PROFILE["default_value"], key=keys["obj_y"])
 
 # --- 2. CONSTRAINTS SECTION ---
 st.subheader("Constraints")
-num_constraints = st.number_input("Total Constraints", 1, 10, 4, key=f"num_con_{st.session_state.reset_counter}")
+num_constraints = st.number_input("Total Constraints", 1, LP_PROFILE["max_constraints"], LP_PROFILE["default_constraints"], key=keys["num_con"])
 
-constraints_data = []
+# One grid widget for every constraint row instead of four widgets per row.
+# The grid's input frame only changes with the row count, and is rebuilt from the last edits
+if len(st.session_state.get("constraints_base", ())) != num_constraints:
+    st.session_state.constraints_base = resize_constraints(st.session_state.get("constraints_edited"), num_constraints)
 
-# Desktop Headers
-h_cols = st.columns([2, 2, 1.5, 2])
-h_cols[0].caption("X Coefficient")
-h_cols[1].caption("Y Coefficient")
-h_cols[2].caption("Relation")
-h_cols[3].caption("RHS / Limit")
+edited_constraints = st.data_editor(
+    st.session_state.constraints_base,
+    key=keys["constraints"],
+    num_rows="fixed",
+    hide_index=True,
+    use_container_width=True,
+    column_config={
+        "x": st.column_config.NumberColumn("X Coefficient", required=True),
+        "y": st.column_config.NumberColumn("Y Coefficient", required=True),
+        "rel": st.column_config.SelectboxColumn("Relation", options=list(REL_CODES), required=True),
+        "rhs": st.column_config.NumberColumn("RHS / Limit", required=True),
+    },
+)
+st.session_state.constraints_edited = edited_constraints
 
-for i in range(num_constraints):
-    cols = st.columns([2, 2, 1.5, 2])
-    
-    val_x = cols[0].number_input(f"X Coeff {i+1}", label_visibility="collapsed", value=0.0, key=f"x{i}_{st.session_state.reset_counter}")
-    val_y = cols[1].number_input(f"Y Coeff {i+1}", label_visibility="collapsed", value=0.0, key=f"y{i}_{st.session_state.reset_counter}")
-    rel = cols[2].selectbox(f"Rel {i+1}", ["<=", ">=", "="], label_visibility="collapsed", key=f"rel{i}_{st.session_state.reset_counter}")
-    rhs = cols[3].number_input(f"Limit {i+1}", label_visibility="collapsed", value=0.0, key=f"rhs{i}_{st.session_state.reset_counter}")
-    
-    constraints_data.append({"x": val_x, "y": val_y, "rel": rel, "rhs": rhs})
+# Cleared cells come back as missing values; treat them as the defaults
+constraints_data = edited_constraints.fillna({
+    "x": LP_PROFILE["default_value"], "y": LP_PROFILE["default_value"],
+    "rel": "<=", "rhs": LP_PROFILE["default_value"],
+}).to_dict("records")
 
 st.write("")
 col_solve, col_reset = st.columns([4, 1])
@@ -98,82 +269,59 @@ if solve_btn:
         c = np.array([c1, c2])
         c_scipy = -c if mode == "Maximize" else c
         
-        A_ub, b_ub, A_eq, b_eq = [], [], [], []
-        valid_constraints = 0
-        
         # 2. Filter out empty constraints to prevent matrix crashes
-        for con in constraints_data:
-            if con["x"] == 0.0 and con["y"] == 0.0:
-                continue
-            
-            valid_constraints += 1
-            row = [con["x"], con["y"]]
-            
-            if con["rel"] == "<=":
-                A_ub.append(row); b_ub.append(con["rhs"])
-            elif con["rel"] == ">=":
-                A_ub.append([-v for v in row]); b_ub.append(-con["rhs"])
-            else:
-                A_eq.append(row); b_eq.append(con["rhs"])
+        active_constraints = tuple(
+            (con["x"], con["y"], con["rel"], con["rhs"])
+            for con in constraints_data
+            if not (con["x"] == 0.0 and con["y"] == 0.0)
+        )
 
         # 3. Ensure at least one constraint has data
-        if valid_constraints == 0:
+        if len(active_constraints) == 0:
             st.error("Validation Error: Please enter at least one valid constraint.")
         else:
-            iteration_logs = []
-            def callback(res):
-                iteration_logs.append({"Z": res.fun, "X": res.x[0], "Y": res.x[1]})
-
             # 4. Try running the math solver
             try:
-                res = linprog(c_scipy, A_ub=np.array(A_ub) if len(A_ub) > 0 else None, 
-                              b_ub=np.array(b_ub) if len(b_ub) > 0 else None, 
-                              A_eq=np.array(A_eq) if len(A_eq) > 0 else None, 
-                              b_eq=np.array(b_eq) if len(b_eq) > 0 else None, 
-                              method='simplex', callback=callback)
-
-                if res.success:
-                    final_z = -res.fun if mode == "Maximize" else res.fun
+                success, fun, x, message, path = solve_lp(tuple(c_scipy), active_constraints)
+
+                if success:
+                    final_z = -fun if mode == "Maximize" else fun
                     # Fix the negative zero floating-point quirk
                     if final_z == 0.0:
                         final_z = 0.0
                     
                     m1, m2, m3 = st.columns(3)
                     m1.metric(f"Optimal {mode[:3]}. Z", f"{final_z:,.2f}")
-                    m2.metric("Final X Value", f"{res.x[0]:.3f}")
-                    m3.metric("Final Y Value", f"{res.x[1]:.3f}")
+                    m2.metric("Final X Value", f"{x[0]:.3f}")
+                    m3.metric("Final Y Value", f"{x[1]:.3f}")
 
                     st.write("")
                     with st.expander("Show Iteration History Details", expanded=True):
                         st.info("""
-                        **Technical Note:** The iteration path is determined by the solver's pivot selection rules, which prioritize numerical stability. 
-                        While this path can differ from manual textbook methods (like Big-M or Two-Phase) due to different tie-breaking 
-                        logic, the solver will always arrive at the same correct optimal result.
+                        **Technical Note:** The problem is solved with the HiGHS dual simplex, which does not expose its intermediate pivots. 
+                        The history below walks the feasible corner points of the region in order of improving Z, ending at the optimum. 
+                        It can differ from manual textbook methods (like Big-M or Two-Phase), but the solver will always arrive at the same correct optimal result.
                         """)
                         
-                        iter_df = pd.DataFrame(iteration_logs)
+                        # HiGHS has no per-pivot callback, so the history is rebuilt from the feasible corner points
+                        logs_tuple = tuple(path)
                         
-                        # 5. Handle the 0-Step edge case gracefully
-                        if not iter_df.empty:
-                            if mode == "Maximize": iter_df["Z"] = -iter_df["Z"]
-                            iter_df.columns = ["Objective Value (Z)", "X Position", "Y Position"]
-                            iter_df = iter_df.drop_duplicates().reset_index(drop=True)
-                            iter_df.index.name = "Step"
-
-                            def bold_last_row(row):
-                                return ['font-weight: bold' if row.name == len(iter_df) - 1 else '' for _ in row]
-
-                            st.table(iter_df.style.apply(bold_last_row, axis=1).format("{:.3f}"))
-                        else:
-                            st.success("The algorithm found the optimal solution immediately (0 iterations required).")
-                            instant_df = pd.DataFrame([{
-                                "Objective Value (Z)": final_z, 
-                                "X Position": res.x[0], 
-                                "Y Position": res.x[1]
-                            }])
-                            instant_df.index.name = "Step"
-                            st.table(instant_df.style.format("{:.3f}"))
+                        # 5. Show the path; it always ends at the optimum, so it is never empty
+                        iter_df = build_iter_table(logs_tuple, mode)
+                        # Columns stay numeric so header sorting is numeric; the grid only formats them
+                        st.dataframe(
+                            iter_df,
+                            use_container_width=True,
+                            column_config={col: st.column_config.NumberColumn(format="%.3f") for col in iter_df.columns},
+                        )
+
+                        last_row = iter_df.iloc[-1]
+                        st.markdown(f"**Step {iter_df.index[-1]} (Optimal):** " + ", ".join(f"{col} = {val:.3f}" for col, val in last_row.items()))
                 else:
-                    st.error(f"Solver Error: {res.message}")
+                    st.error(f"Solver Error: {message}")
             except Exception as e:
                 st.error(f"Mathematical Error: {str(e)}. Please check your inputs.")
+
+# --- 4. SOLVER WARMUP ---
+# Runs after the page is drawn so it never delays first paint
+warmup_linprog()